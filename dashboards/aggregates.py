@@ -0,0 +1,87 @@
+import numpy as np
+import pandas as pd
+
+from dashboards import indexes
+
+# Pre-aggregated KPI averages.
+#
+# The comparison charts average the same KPI columns over the same groups
+# (team, tier, period) on every rerun. A Cube keeps the sum and count of each
+# metric per combination of its keys, so any of those averages is a sum over
+# a few dozen cells instead of a groupby over every row. A PeriodArray holds
+# every tutor's value per period, so one tutor's history is an array slice.
+
+
+class Cube:
+    """Sums and counts of `metrics` per combination of the `keys` columns.
+
+    Rows with a blank key are kept under a NaN key, so that averages over
+    all values of that key still include them, like they would on the rows.
+    """
+
+    def __init__(self, frame, keys, metrics):
+        grouped = frame.groupby(keys, observed=True, dropna=False)[metrics]
+        self.sums = grouped.sum()
+        self.counts = grouped.count()
+
+    def means(self, by, **filters):
+        """Mean of every metric per value of the key(s) `by`.
+
+        Only the cells whose keys equal `filters` (key=value) are included.
+        Groups with no rows are left out; groups whose rows are all blank for
+        a metric get NaN for it, as DataFrame.groupby().mean() would.
+        """
+        mask = np.ones(len(self.sums), dtype=bool)
+        for key, value in filters.items():
+            mask &= self.sums.index.get_level_values(key) == value
+        sums = self.sums[mask].groupby(level=by, observed=True).sum()
+        counts = self.counts[mask].groupby(level=by, observed=True).sum()
+        return sums / counts.where(counts > 0)
+
+
+class PeriodArray:
+    """MonthlyMetric packed into a dense (tutor, period, metric) array.
+
+    values[t, p, m] is tutor t's value of metric m in period p (the period_idx),
+    NaN where the tutor has no row for that period. The few tutors with more
+    than one row for a period get the mean of those rows. Tutors are found by
+    indexes.tutor_key.
+    """
+
+    def __init__(self, frame, metrics):
+        frame = frame[(frame["period_idx"] >= 0) & frame["Tutor Name"].notna()]
+        self.metrics = list(metrics)
+
+        names, uniques = pd.factorize(frame["Tutor Name"])
+        keys, self.tutors = pd.factorize(pd.Index([indexes.tutor_key(name) for name in uniques], dtype=object))
+        tutor_idx = keys[names]
+        period_idx = frame["period_idx"].to_numpy()
+
+        n_periods = period_idx.max() + 1 if len(frame) else 0
+        self.labels = np.empty(n_periods, dtype=object)
+        self.labels[period_idx] = frame["Date Range"].to_numpy()
+
+        shape = (len(self.tutors), n_periods, len(self.metrics))
+        values = frame[self.metrics].to_numpy(dtype="float64")
+        sums = np.zeros(shape)
+        counts = np.zeros(shape)
+        np.add.at(sums, (tutor_idx, period_idx), np.nan_to_num(values))
+        np.add.at(counts, (tutor_idx, period_idx), ~np.isnan(values))
+        with np.errstate(invalid="ignore"):
+            self.values = np.where(counts > 0, sums / counts, np.nan)
+
+        # Whether the tutor has a row for the period at all (even with blank values)
+        self.present = np.zeros(shape[:2], dtype=bool)
+        self.present[tutor_idx, period_idx] = True
+
+    def recent(self, tutor, n):
+        """The tutor's last `n` periods with a row, oldest first.
+
+        A frame with a "Date Range" column plus one column per metric; empty
+        if the tutor has no rows.
+        """
+        t = self.tutors.get_indexer([indexes.tutor_key(tutor)])[0]
+        periods = np.flatnonzero(self.present[t])[-n:] if t >= 0 else np.array([], dtype=int)
+        frame = pd.DataFrame(self.values[t, periods] if t >= 0 else None, columns=self.metrics)
+        frame.insert(0, "Date Range", self.labels[periods])
+        return frame
@@ -0,0 +1,63 @@
+import collections
+import threading
+
+from plotly.subplots import make_subplots
+
+# Cache of the plotly figures drawn for a selected tutor.
+#
+# The Annual Reviews and KPI Trends pages draw two charts per metric for the
+# tutor picked in the selector, and used to build all of them again on every
+# rerun. Built figures are kept here, shared by all sessions and keyed by
+# everything they are drawn from (FL, tutor, metric, chart and data version),
+# so showing a tutor again doesn't build or validate anything. Like the shared
+# frames in data, the figures returned are shared: treat them as read-only.
+
+# Figures kept. A built figure holds its own copy of the layout template, about
+# 50 KB for a bar chart and 250 KB for a plotly.express line chart, so this is
+# about 130 MB at most (the KPI Trends charts of about 35 tutors)
+MAX_FIGURES = 512
+
+_figures = collections.OrderedDict()  # key -> go.Figure, least recently used first
+_lock = threading.Lock()
+
+
+def figure(key, build):
+    """Return the figure for `key`, calling build() to make it if it isn't cached.
+
+    `key` has to identify everything the figure shows, including the data it
+    was drawn from (see data.data_version). The figure is shared: pass it to
+    st.plotly_chart as is, but don't update it.
+    """
+    with _lock:
+        fig = _figures.get(key)
+        if fig is not None:
+            _figures.move_to_end(key)
+    if fig is None:
+        fig = build()
+        with _lock:
+            _figures[key] = fig
+            _figures.move_to_end(key)
+            while len(_figures) > MAX_FIGURES:
+                _figures.popitem(last=False)
+    return fig
+
+
+def grid(rows, row_height=300):
+    """Draw rows of figures as a single figure, one subplot per figure.
+
+    `rows` is a list of (title, figures) pairs. Each subplot is titled
+    "<row title>: <figure title>"; only the figures' traces are carried over.
+    """
+    n_cols = max(len(figures) for _, figures in rows)
+    titles = [f"{title}: {fig.layout.title.text}" for title, figures in rows for fig in figures]
+    combined = make_subplots(rows=len(rows), cols=n_cols, subplot_titles=titles)
+    for row, (_, figures) in enumerate(rows, start=1):
+        for col, fig in enumerate(figures, start=1):
+            for trace in fig.data:
+                combined.add_trace(trace, row=row, col=col)
+    combined.update_layout(
+        height=row_height * len(rows),
+        showlegend=False,
+        margin=dict(l=20, r=20, t=40, b=20)
+    )
+    return combined
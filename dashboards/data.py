@@ -0,0 +1,508 @@
+import os
+import threading
+
+import pandas as pd
+import streamlit as st
+
+from dashboards import aggregates, indexes, ingest
+
+# Shared data layer for every Faculty Leader dashboard.
+#
+# Each source file is held by a single _Source object for the whole server
+# process, keyed by the content version of the file (see
+# ingest.source_version), so there is one copy of each sheet per data version
+# no matter how many FLs are logged in. The frames returned here are shared
+# between sessions: treat them as read-only and `.copy()` before adding or
+# overwriting columns.
+
+CONCERNS_FILE = "Tutor_Concerns.csv"
+REPURCHASE_FILE = "Repurchase_Summary_Annual_Reviews.xlsx"
+REPURCHASE_SHEET = "Sheet 1"
+
+# When a source file changes, keep serving the previous frames while the new
+# version is read in a background thread. Set to False to make the next page
+# load wait for the re-read instead.
+STALE_WHILE_REVALIDATE = True
+
+# Columns each dashboard page uses, per sheet. Only columns listed here are
+# loaded into the shared cache, and a page asking for its view gets just its
+# own columns, so add a column here before using it on a page. Columns a sheet
+# doesn't have are skipped.
+VIEW_COLUMNS = {
+    "Annual Reviews": {
+        "AnnualReview": [
+            "tutor_name",
+            "tier",
+            "fl",
+            "sessions_on_time",
+            "prep_time",
+            "average_nps",
+            "current_sci",
+            "availability_percent",
+            "delivery_percent",
+        ],
+        "MonthlyMetric": [
+            "Tutor Name",
+            "Tier",
+            "Faculty Leader",
+            "% Parents Updates Done on Time",
+            "% of Active Students with Progress Updates Completed in last 2 months",
+        ],
+        "MasterTutor": ["Full Name", "Faculty Leader"],
+        "SubjectAddition": ["tutor_name", "subject"],
+        "Repurchases": [
+            "Tutor Name",
+            "Current Tier",
+            "Team Name",
+            "Delivery Target",
+            "Repurchases Weighted",
+        ],
+    },
+    "KPI Trends": {
+        "MonthlyMetric": [
+            "Tutor Name",
+            "Date Range",
+            "% to Delivery Target",
+            "% to Availability Target",
+            "% Sessions on Time",
+            "% Parents Updates Done on Time",
+            "% of Active Students with Progress Updates Completed in last 2 months",
+            "Weighted Repurchases",
+            "Ratio of PPW Events with Attached PPWs",
+        ],
+        "AnnualReview": ["tutor_name", "tier"],
+        "MasterTutor": ["Full Name", "Faculty Leader"],
+    },
+    "KPI Table": {
+        "MonthlyMetric": [
+            "Tutor Name",
+            "Date Range",
+            "period_idx",
+            "Tier",
+            "Faculty Leader",
+            "% to Delivery Target",
+            "% to Availability Target",
+            "% Sessions on Time",
+            "% Parents Updates Done on Time",
+            "% of Active Students with Progress Updates Completed in last 2 months",
+        ],
+        "MonthlyMetricFullData": [
+            "Tutor Name",
+            "Faculty Leader Name",
+            "Current Tier",
+            "Delivery Target",
+            "Avg. Delivery Actual",
+            "% to Delivery Target",
+            "Availability Target",
+            "Avg. Availability Actual",
+            "% to Availability Target",
+            "Prep Time %",
+            "% Parents Updates Done on Time",
+            "% Sessions on Time",
+            "Ratio of PPW Events with Attached PPWs",
+            "% of Active Students with Progress Updates Completed",
+            "# of NPS Scores",
+            "Avg. NPS Score",
+            "Weighted Repurchases",
+            "Autoattendance",
+            "New 1 on 1 Students",
+            "total 1 on 1 students",
+            "Average AI Score for Progress Updates",
+        ],
+    },
+}
+
+
+# Column holding the Faculty Leader (the team, for repurchases) of each row
+TEAM_COLUMNS = {
+    "MonthlyMetric": "Faculty Leader",
+    "MonthlyMetricFullData": "Faculty Leader Name",
+    "MasterTutor": "Faculty Leader",
+    "AnnualReview": "fl",
+    "Repurchases": "Team Name",
+    "Concerns": "Faculty Leader Name",
+}
+
+
+# Column naming the tutor of each row
+TUTOR_COLUMNS = {
+    "MonthlyMetric": "Tutor Name",
+    "MonthlyMetricFullData": "Tutor Name",
+    "MasterTutor": "Full Name",
+    "AnnualReview": "tutor_name",
+    "SubjectAddition": "tutor_name",
+    "Repurchases": "Tutor Name",
+    "Concerns": "Tutor Name",
+}
+
+
+# MonthlyMetric KPIs averaged by the team, tier and period comparisons
+KPI_METRICS = [
+    "% to Delivery Target",
+    "% to Availability Target",
+    "% Sessions on Time",
+    "% Parents Updates Done on Time",
+    "% of Active Students with Progress Updates Completed in last 2 months",
+    "Weighted Repurchases",
+    "Ratio of PPW Events with Attached PPWs",
+]
+
+
+def _columns(name):
+    """Every column any view uses from `name`."""
+    columns = []
+    for sheets in VIEW_COLUMNS.values():
+        columns += [col for col in sheets.get(name, []) if col not in columns]
+    return columns
+
+
+def _view(df, name, view):
+    # The column subset is a copy, so it is made once per frame and view (and
+    # shared like the frame itself) rather than on every call
+    if view is None:
+        return df
+    return indexes.derived(df, f"{view} view", lambda df: df[ingest.project(df.columns, VIEW_COLUMNS[view][name])])
+
+
+class _SingleFlight:
+    """Run at most one call per key at a time.
+
+    Callers asking for a key that is already being computed wait for that call
+    and share its result (or exception) instead of starting their own. Several
+    sessions hitting a cold or changed file at once therefore cost one read.
+    Keys are (file, version) pairs; loads and coalesced calls are counted per
+    file.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self._counts = {}
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {"done": threading.Event()}
+            counts = self._counts.setdefault(key[0], {"loads": 0, "coalesced": 0})
+            counts["loads" if leader else "coalesced"] += 1
+
+        if not leader:
+            call["done"].wait()
+            if "error" in call:
+                raise call["error"]
+            return call["result"]
+
+        try:
+            call["result"] = fn()
+            return call["result"]
+        except Exception as e:
+            call["error"] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call["done"].set()
+
+    def counts(self):
+        with self._lock:
+            return {name: dict(c) for name, c in self._counts.items()}
+
+
+_flights = _SingleFlight()
+
+
+class _Source:
+    """The latest data read from one source file.
+
+    The first get() reads the file synchronously. After that, get() never waits
+    on a re-read: when the file's version changes it returns the data it
+    already has and starts a background thread that reads the new version and
+    swaps it in atomically once it is complete.
+    """
+
+    def __init__(self, file, read):
+        self.file = file
+        self.read = read
+        self.error = None
+        self._state = None  # (version, data), only ever replaced as a whole
+        self._failed_version = None
+        self._refreshing = False
+        self._lock = threading.Lock()
+
+    def get(self):
+        version = ingest.source_version(self.file)
+        state = self._state
+        if state is not None and state[0] == version:
+            # The file may be back at the version served after a failed re-read
+            self.error = None
+            self._failed_version = None
+            return state[1]
+        if state is None or not STALE_WHILE_REVALIDATE:
+            return self._load(version)
+        self._refresh_in_background(version)
+        return state[1]
+
+    @property
+    def version(self):
+        """Version of the data get() currently returns (None before the first read)."""
+        state = self._state
+        return state[0] if state is not None else None
+
+    def refresh(self):
+        """Bring the data up to date with the file now, waiting for the read."""
+        version = ingest.source_version(self.file)
+        state = self._state
+        if state is None or state[0] != version:
+            self._load(version)
+
+    def _load(self, version):
+        data = _flights.do((self.file, version), lambda: self.read(self.file))
+        self._state = (version, data)
+        self.error = None
+        return data
+
+    def _refresh_in_background(self, version):
+        with self._lock:
+            if self._refreshing or self._failed_version == version:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_load, args=(version,), daemon=True).start()
+
+    def _background_load(self, version):
+        try:
+            self._load(version)
+        except Exception as e:
+            # Keep serving the previous data; don't retry until the file changes again
+            self.error = e
+            self._failed_version = version
+        finally:
+            self._refreshing = False
+
+
+_sources = {}
+_sources_lock = threading.Lock()
+
+
+def _source(file, read):
+    with _sources_lock:
+        if file not in _sources:
+            _sources[file] = _Source(file, read)
+        return _sources[file]
+
+
+def load_stats():
+    """{file: {"loads": reads performed, "coalesced": requests that shared one}}"""
+    return _flights.counts()
+
+
+def data_version():
+    """Identify the data currently being served, for keying caches of things built from it.
+
+    This changes once a new version of any source file has been swapped in:
+    while a re-read runs in the background it still names the data in use.
+    Read it before loading the data the cached thing is built from. A new
+    version swapped in between can then only leave an entry under a key that
+    is never asked for again, not stale data under the current key.
+    """
+    with _sources_lock:
+        sources = list(_sources.values())
+    return tuple(sorted((source.file, source.version) for source in sources))
+
+
+def _read_workbook(file):
+    columns = {sheet: _columns(sheet) for sheet in ingest.WORKBOOK_SHEETS}
+    return ingest.read_workbook(file, ingest.WORKBOOK_SHEETS, columns)
+
+
+def _read_repurchases(file):
+    return ingest.read_sheet(file, REPURCHASE_SHEET, _columns("Repurchases"))
+
+
+def _read_concerns(file):
+    return ingest.compact(pd.read_csv(file))
+
+
+_READERS = {
+    ingest.WORKBOOK_FILE: _read_workbook,
+    REPURCHASE_FILE: _read_repurchases,
+    CONCERNS_FILE: _read_concerns,
+}
+
+
+def warm(file):
+    """Read `file` (one of the source files in _READERS) into the shared cache now,
+    so no page load has to wait on it.
+    """
+    _source(file, _READERS[file]).refresh()
+
+
+def _load(file, read, default):
+    if not os.path.exists(file):
+        return default
+    source = _source(file, read)
+    try:
+        data = source.get()
+    except Exception as e:
+        st.warning(f"Could not read {file}: {e}")
+        return default
+    if source.error is not None:
+        st.warning(f"Could not reload {file}, showing the previous version: {source.error}")
+    return data
+
+
+def load_workbook():
+    """Every sheet of December_Annual_Reviews.xlsx, read in a single pass.
+
+    Only the columns listed in VIEW_COLUMNS are loaded.
+    """
+    return _load(ingest.WORKBOOK_FILE, _read_workbook, {})
+
+
+# The sheet loaders below take an optional `view` (a key of VIEW_COLUMNS) and
+# then return only the columns that view declares for the sheet.
+
+def load_sheet(sheet, view=None):
+    return _view(load_workbook().get(sheet, pd.DataFrame()), sheet, view)
+
+
+def load_monthly_metric(view=None):
+    return load_sheet("MonthlyMetric", view)
+
+
+def load_full_metrics(view=None):
+    return load_sheet("MonthlyMetricFullData", view)
+
+
+def load_annual_reviews(view=None):
+    return load_sheet("AnnualReview", view)
+
+
+def load_subject_additions(view=None):
+    return load_sheet("SubjectAddition", view)
+
+
+def load_master_tutor(view=None):
+    df = load_workbook().get("MasterTutor")
+    if df is None:
+        st.error(f"MasterTutor sheet not found in {ingest.WORKBOOK_FILE}")
+        return pd.DataFrame()
+    return _view(df, "MasterTutor", view)
+
+
+def load_repurchases(view=None):
+    return _view(_load(REPURCHASE_FILE, _read_repurchases, pd.DataFrame()), "Repurchases", view)
+
+
+def load_tutor_concerns():
+    return _load(CONCERNS_FILE, _read_concerns, pd.DataFrame())
+
+
+def _frame(name):
+    if name == "Repurchases":
+        return _load(REPURCHASE_FILE, _read_repurchases, pd.DataFrame())
+    if name == "Concerns":
+        return load_tutor_concerns()
+    return load_workbook().get(name, pd.DataFrame())
+
+
+def load_team(name, team, view=None):
+    """The rows of `name` (a sheet, "Repurchases" or "Concerns") that belong to `team`.
+
+    Each source is partitioned by its TEAM_COLUMNS column once per data
+    version, so this is a dictionary lookup rather than a scan. The frame
+    returned is shared like every other one here.
+    """
+    df = _frame(name)
+    parts = indexes.derived(df, "teams", lambda df: indexes.partition(df, TEAM_COLUMNS[name]))
+    return _view(parts.get(team, df.iloc[:0]), name, view)
+
+
+def _rosters(workbook, name):
+    """{FL: rows of sheet `name` for the tutors on the FL's MasterTutor roster}
+
+    Unlike load_team this goes by who the tutor reports to now, not by the
+    Faculty Leader recorded on each row.
+    """
+    def build(df):
+        roster = workbook.get("MasterTutor", pd.DataFrame()).dropna(subset=["Full Name"])
+        groups = roster.groupby("Faculty Leader", observed=True)["Full Name"]
+        return indexes.partition_by_members(df, "Tutor Name", {fl: names for fl, names in groups})
+
+    return indexes.derived(workbook.get(name, pd.DataFrame()), "rosters", build)
+
+
+def _kpi_cube(df, keys):
+    return aggregates.Cube(df[df["period_idx"] >= 0], keys, KPI_METRICS)
+
+
+def load_kpi_means(by, **filters):
+    """Means of the KPI_METRICS per `by`, e.g. per "Faculty Leader" for one
+    period_idx and Tier (see aggregates.Cube.means).
+
+    They come from a cube over (period_idx, Faculty Leader, Tier) built once
+    per data version.
+    """
+    df = load_sheet("MonthlyMetric")
+    cube = indexes.derived(df, "kpi cube", lambda df: _kpi_cube(df, ["period_idx", "Faculty Leader", "Tier"]))
+    return cube.means(by, **filters)
+
+
+def _period_means(cubes, group):
+    """Per-period means of one group's cube, oldest period first."""
+    if group not in cubes:
+        return pd.DataFrame()
+    return cubes[group].means(["period_idx", "Date Range"]).reset_index()
+
+
+def _group_cubes(parts):
+    return {group: _kpi_cube(part, ["period_idx", "Date Range"]) for group, part in parts.items()}
+
+
+def load_roster_means(fl):
+    """KPI means per period over the tutors on `fl`'s roster (see _rosters).
+
+    Columns are period_idx, Date Range and the KPI_METRICS, oldest period
+    first; empty if none of the tutors has MonthlyMetric rows.
+    """
+    workbook = load_workbook()
+    df = workbook.get("MonthlyMetric", pd.DataFrame())
+    cubes = indexes.derived(df, "roster cubes", lambda df: _group_cubes(_rosters(workbook, "MonthlyMetric")))
+    return _period_means(cubes, fl)
+
+
+def load_tier_means(tier):
+    """Like load_roster_means, over the tutors whose AnnualReview tier is `tier`."""
+    workbook = load_workbook()
+    df = workbook.get("MonthlyMetric", pd.DataFrame())
+
+    def build(df):
+        annual = workbook.get("AnnualReview", pd.DataFrame()).dropna(subset=["tutor_name"])
+        groups = {tier: names for tier, names in annual.groupby("tier", observed=True)["tutor_name"]}
+        return _group_cubes(indexes.partition_by_members(df, "Tutor Name", groups))
+
+    return _period_means(indexes.derived(df, "tier cubes", build), tier)
+
+
+def load_tutor_periods(tutor, n):
+    """The KPI_METRICS of `tutor`'s last `n` periods in MonthlyMetric, oldest first.
+
+    One row per period, with its "Date Range" label; sliced out of a dense
+    tutor x period x metric array built once per data version.
+    """
+    df = load_sheet("MonthlyMetric")
+    array = indexes.derived(df, "tutor periods", lambda df: aggregates.PeriodArray(df, KPI_METRICS))
+    return array.recent(tutor, n)
+
+
+def load_tutor(name, tutor, view=None):
+    """The rows of `name` (a sheet, "Repurchases" or "Concerns") for one tutor.
+
+    Tutors are matched on indexes.tutor_key, through an index of every
+    tutor's row positions that is built once per data version.
+    """
+    df = _frame(name)
+    rows = indexes.derived(df, "tutors", lambda df: indexes.tutor_rows(df, TUTOR_COLUMNS[name]))
+    positions = rows.get(indexes.tutor_key(tutor))
+    return _view(df.iloc[:0] if positions is None else df.take(positions), name, view)
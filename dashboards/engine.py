@@ -0,0 +1,740 @@
+import streamlit as st
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+from dashboards import charts, data, exports, fls, leaderboard, periods, reviews
+
+# The dashboard of every Faculty Leader. main.py calls render_app with the
+# logged-in FL's key in fls.FACULTY_LEADERS; whatever differs between FLs
+# (name, extra sections) comes from their entry there.
+
+def load_tutor_list(faculty_leader_name):
+    data.load_master_tutor()  # shows an error if the sheet is missing
+    return data.load_team("MasterTutor", faculty_leader_name)["Full Name"].dropna().sort_values().tolist()
+
+def render_app(fl, config):
+    leader = fls.FACULTY_LEADERS[fl]
+
+    st.markdown("""
+        <style>
+            .main-title {
+                font-size: 2.5em;
+                font-weight: bold;
+                color: #004466;
+                margin-bottom: 0.3em;
+            }
+            .block-container {
+                padding-top: 2rem;
+            }
+            section[data-testid="stSidebar"] {
+                background-color: #F1F3F5;
+            }
+            .metric-label {
+                font-size: 1.1rem;
+                color: #666;
+            }
+        </style>
+    """, unsafe_allow_html=True)
+
+
+    #st.title("Tutor KPI Tracker")
+    st.markdown(f'<div class="main-title">{fl} Tutor Data 📊</div>', unsafe_allow_html=True)
+
+
+    # Sidebar Navigation
+    page = st.sidebar.radio("📂 Navigation", [
+        "Concerns",
+        "KPI Table",
+        "KPI Trends",
+        "Grades Summary",
+        "Annual Reviews"
+    ])
+
+    # Filter tutors by Faculty Leader
+    faculty_leader_name = leader["name"]
+
+
+    # ---- Annual Reviews Tab ----
+    st.sidebar.markdown("---")
+    st.sidebar.markdown("### 📋 Annual Reviews")
+
+
+
+
+    # ---- Annual Reviews Tab ----
+    # A fragment: picking another tutor only reruns this page
+    @st.fragment
+    def annual_reviews_page():
+        st.markdown('<div class="main-title">Annual Reviews 📋</div>', unsafe_allow_html=True)
+
+        roster_tutors = load_tutor_list(faculty_leader_name)
+
+        selected_annual_tutor = st.selectbox("Select a Tutor:", roster_tutors)
+
+        if selected_annual_tutor:
+            # Read before the data the charts are drawn from, so they're never
+            # cached under a newer version than the one they show
+            version = data.data_version()
+            metrics = reviews.tutor_metrics(faculty_leader_name, selected_annual_tutor)
+
+            if metrics is not None:
+                # Grid mode draws the charts before and after Subject Additions as
+                # one figure each: two payloads instead of 18
+                grid_mode = st.toggle("Show the charts as one figure per section", help="Quicker to load on a slow connection")
+                grid_rows = []
+
+                def show_grid(section):
+                    key = (faculty_leader_name, selected_annual_tutor, "all metrics", version)
+                    fig_grid = charts.figure(key + ("Annual Reviews", "grid", section), lambda: charts.grid(grid_rows))
+                    st.plotly_chart(fig_grid, width="stretch")
+
+                # Loop through metrics
+                for metric in metrics:
+                    # Insert Subject Additions just before Percent to Availability
+                    if metric["column"] == reviews.SUBJECTS_BEFORE:
+                        if grid_mode and grid_rows:
+                            show_grid("before subjects")
+                            grid_rows = []
+                        st.divider()
+                        st.subheader("Subject Additions")
+                        tutor_subjects = reviews.subjects(selected_annual_tutor)
+                        if tutor_subjects is None:
+                            st.error("Column 'tutor_name' not found in Subject Addition sheet.")
+                            tutor_subjects = []
+
+                        if len(tutor_subjects) == 0:
+                            st.markdown("<p style='color: gray; font-style: italic; font-size: 1.1rem;'>None</p>", unsafe_allow_html=True)
+                        else:
+                            for subj in tutor_subjects:
+                                st.markdown(
+                                    f"""
+                                    <div style='
+                                        background-color: #f8f9fa;
+                                        border-radius: 8px;
+                                        padding: 10px 15px;
+                                        margin: 6px 0;
+                                        font-size: 1.1rem;
+                                        font-weight: 500;
+                                        color: #333;
+                                        box-shadow: 0 1px 3px rgba(0,0,0,0.1);
+                                    '>
+                                    📘 {subj}
+                                    </div>
+                                    """,
+                                    unsafe_allow_html=True
+                                )
+
+                    # --- Plots (built once per tutor, metric and data version) ---
+                    key = (faculty_leader_name, selected_annual_tutor, metric["column"], version)
+                    fig_team = charts.figure(key + ("Annual Reviews", "team"), lambda: reviews.team_figure(selected_annual_tutor, metric))
+                    fig_tier = charts.figure(key + ("Annual Reviews", "tier"), lambda: reviews.tier_figure(selected_annual_tutor, metric))
+
+                    if grid_mode:
+                        grid_rows.append((f"{metric['label']} ({metric['display']})", [fig_team, fig_tier]))
+                        continue
+
+                    st.markdown("<hr>", unsafe_allow_html=True)
+                    st.markdown(f"<h3 style='text-align:center'>{metric['label']}</h3>", unsafe_allow_html=True)
+
+                    # Layout: 3 columns
+                    col1, col2, col3 = st.columns([1, 1, 1])
+                    with col1:
+                        st.markdown(
+                            f"<div style='font-size:24px; font-weight:bold; text-align:center;'>{selected_annual_tutor}<br>{metric['display']}</div>",
+                            unsafe_allow_html=True
+                        )
+                    with col2:
+                        st.plotly_chart(fig_team, use_container_width=True)
+                    with col3:
+                        st.plotly_chart(fig_tier, use_container_width=True)
+
+                if grid_mode and grid_rows:
+                    show_grid("after subjects")
+
+    if page == "Annual Reviews":
+        annual_reviews_page()
+
+
+
+
+
+    # ---- KPI Trends Tab ----
+    # A fragment: picking another tutor only reruns this page
+    @st.fragment
+    def kpi_trends_page():
+        st.markdown('<div class="main-title">📈 KPI Trends</div>', unsafe_allow_html=True)
+        roster_tutors = load_tutor_list(faculty_leader_name)
+
+
+
+        selected_tutor = st.selectbox("Select a Tutor:", roster_tutors)
+
+        if selected_tutor:
+            # Read before the data the charts are drawn from (see Annual Reviews)
+            version = data.data_version()
+            tutor_tier = data.load_tutor("AnnualReview", selected_tutor, view="KPI Trends")["tier"].values
+            tutor_tier = tutor_tier[0] if len(tutor_tier) > 0 else None
+
+            # ---- Tutor's last 6 periods (one row per period) ----
+            tutor_plot_df = data.load_tutor_periods(selected_tutor, 6)
+
+            # ---- Team and tier averages per period (precomputed per data version) ----
+            team_means = data.load_roster_means(faculty_leader_name)
+            tier_means = data.load_tier_means(tutor_tier) if tutor_tier else pd.DataFrame()
+
+            metrics = {
+                "% to Delivery Target": "% to Delivery Target",
+                "% to Availability Target": "% to Availability Target",
+                "% Sessions on Time": "% Sessions on Time",
+                "% Parents Updates Done on Time": "% to Parent Updates Completed",
+                "% of Active Students with Progress Updates Completed in last 2 months": "% Progress Updates Completed",
+                "Weighted Repurchases": "Weighted Repurchases",
+                "Ratio of PPW Events with Attached PPWs": "PPW Attachment Ratio"
+            }
+
+            percent_metrics = [
+                "% to Delivery Target",
+                "% to Availability Target",
+                "% Sessions on Time",
+                "% Parents Updates Done on Time",
+                "% of Active Students with Progress Updates Completed in last 2 months"
+            ]
+
+            for metric, label in metrics.items():
+                st.markdown("<hr>", unsafe_allow_html=True)
+                st.markdown(f"<h3 style='text-align:center'>{label}</h3>", unsafe_allow_html=True)
+
+                # Convert percentages
+                scale = 100 if metric in percent_metrics else 1
+                tutor_values = tutor_plot_df[metric] * scale
+
+                # Latest value for display
+                latest_value = tutor_values.iloc[-1] if not tutor_plot_df.empty else None
+                latest_display = f"{latest_value:.0f}%" if metric in percent_metrics else f"{latest_value:.2f}"
+
+                key = (faculty_leader_name, selected_tutor, metric, version)
+
+                # ---- Tutor vs Team ----
+                if not team_means.empty:
+                    def build_team():
+                        team_grouped = team_means.tail(6).copy()
+                        team_grouped[metric] = team_grouped[metric] * scale
+
+                        fig_team = px.line(
+                            team_grouped,
+                            x="Date Range",
+                            y=metric,
+                            title="VS Team",
+                            markers=True
+                        )
+                        fig_team.add_scatter(
+                            x=tutor_plot_df["Date Range"],
+                            y=tutor_values,
+                            mode="lines+markers",
+                            name=selected_tutor,
+                            line=dict(width=3)
+                        )
+                        fig_team.update_layout(
+                            title=dict(x=0.5, xanchor='center', font=dict(size=16)),
+                            xaxis=dict(tickangle=30),
+                            yaxis_title=None,
+                            xaxis_title=None,
+                            height=350,
+                            margin=dict(l=20, r=20, t=50, b=40)
+                        )
+                        return fig_team
+
+                    fig_team = charts.figure(key + ("KPI Trends", "team"), build_team)
+
+                # ---- Tutor vs Tier ----
+                if not tier_means.empty:
+                    def build_tier():
+                        tier_grouped = tier_means.tail(6).copy()
+                        tier_grouped[metric] = tier_grouped[metric] * scale
+
+                        fig_tier = px.line(
+                            tier_grouped,
+                            x="Date Range",
+                            y=metric,
+                            title="VS Tier",
+                            markers=True
+                        )
+                        fig_tier.add_scatter(
+                            x=tutor_plot_df["Date Range"],
+                            y=tutor_values,
+                            mode="lines+markers",
+                            name=selected_tutor,
+                            line=dict(width=3)
+                        )
+                        fig_tier.update_layout(
+                            title=dict(x=0.5, xanchor='center', font=dict(size=16)),
+                            xaxis=dict(tickangle=30),
+                            yaxis_title=None,
+                            xaxis_title=None,
+                            height=350,
+                            margin=dict(l=20, r=20, t=50, b=40)
+                        )
+                        return fig_tier
+
+                    fig_tier = charts.figure(key + ("KPI Trends", "tier"), build_tier)
+
+                # ---- Layout: two rows ----
+                row1_col1, row1_col2 = st.columns([1, 3])
+                with row1_col1:
+                    st.markdown(
+                        f"<div style='font-size:24px; font-weight:bold; text-align:center;'>{selected_tutor}<br>{latest_display}</div>",
+                        unsafe_allow_html=True
+                    )
+                with row1_col2:
+                    if not team_means.empty:
+                        st.plotly_chart(fig_team, use_container_width=True)
+
+                row2_col1, row2_col2 = st.columns([1, 3])
+                with row2_col1:
+                    st.markdown(
+                        f"<div style='font-size:24px; font-weight:bold; text-align:center;'>{selected_tutor}<br>{latest_display}</div>",
+                        unsafe_allow_html=True
+                    )
+                with row2_col2:
+                    if not tier_means.empty:
+                        st.plotly_chart(fig_tier, use_container_width=True)
+
+    if page == "KPI Trends":
+        kpi_trends_page()
+
+
+    # ---- Concerns Tab ----
+    if page == "Concerns":
+        st.markdown('<div class="main-title">Tutor Concerns 📌</div>', unsafe_allow_html=True)
+
+        # Read before the data the downloads are made of (see data.data_version)
+        version = data.data_version()
+
+        # Rows for this Faculty Leader
+        fl_df = data.load_team("Concerns", faculty_leader_name).copy()
+
+        if fl_df.empty:
+            st.info("No concern data available for your team.")
+        else:
+
+            # --- Team Overview (latest date only) ---
+            
+            fl_df["Date"] = periods.end_dates(fl_df["Date"])
+
+            latest_date = fl_df["Date"].max()
+            latest_df = fl_df[fl_df["Date"] == latest_date]
+
+            st.subheader(f"Team Overview (Latest Date: {latest_date.date()})")
+
+            # Breakdown of # of tutors in each Concern Group
+            concern_counts = latest_df.groupby("Concern Group")["Tutor Name"].nunique().sort_index(ascending=False)
+            st.markdown("**Number of Tutors in Each Concern Group**")
+            st.bar_chart(concern_counts)
+
+            # List of tutors by Concern Group (5 first)
+            for group in sorted(latest_df["Concern Group"].unique(), reverse=True):
+                st.markdown(f"### Concern Group {group}")
+                tutors_in_group = latest_df[latest_df["Concern Group"] == group]["Tutor Name"].tolist()
+                st.write(", ".join(tutors_in_group))
+
+            # Download button for latest team concerns
+            exports.download_buttons(
+                "Download Latest Tutor Concerns",
+                latest_df,
+                f"Tutor_Concerns_{faculty_leader_name}_{latest_date.date()}",
+                ("Latest Concerns", faculty_leader_name, version),
+            )
+
+            st.markdown("---")
+
+            # --- Individual Tutor Selector ---
+            # A fragment: picking another tutor only reruns this part
+            @st.fragment
+            def tutor_concerns():
+                tutor_names = fl_df["Tutor Name"].dropna().unique().tolist()
+                selected_tutor = st.selectbox("Select a Tutor", tutor_names)
+
+                if selected_tutor:
+                    tutor_df = fl_df[fl_df["Tutor Name"] == selected_tutor].sort_values("Date")
+
+                    # Plot concern score over time
+                    fig = px.line(
+                        tutor_df,
+                        x="Date",
+                        y="Concern Group",
+                        markers=True,
+                        title=f"{selected_tutor} Concern Score Over Time"
+                    )
+
+                    # Force y-axis from 1 to 5 and reverse it
+                    fig.update_yaxes(
+                        range=[1, 5],  # 5 at top, 1 at bottom
+                        dtick=1,
+                        title="Concern Group",
+                        autorange=False  # ensure range is respected
+                    )
+
+                    st.plotly_chart(fig, use_container_width=True)
+
+                    # Table of all data for the tutor
+                    st.subheader(f"{selected_tutor} Details")
+                    st.dataframe(tutor_df[["Date", "Concern Group", "Reasons"]])
+
+                    # Download button for individual tutor
+                    exports.download_buttons(
+                        f"Download {selected_tutor} Concerns",
+                        tutor_df,
+                        f"{selected_tutor}_Concerns",
+                        ("Concerns", faculty_leader_name, selected_tutor, version),
+                    )
+
+            tutor_concerns()
+
+
+    # ---------------------- KPI TABLE TAB ----------------------
+    # ---------------------- KPI TABLE TAB ----------------------
+    if page == "KPI Table":
+
+        # Read before the data the downloads are made of (see data.data_version)
+        version = data.data_version()
+
+        df = data.load_monthly_metric(view="KPI Table")
+
+        # --- Filter for latest date range and selected faculty leader ---
+        # --- Get the latest date range (period_idx numbers them chronologically) ---
+        latest_idx = df["period_idx"].max()
+        latest_range = df.loc[df["period_idx"] == latest_idx, "Date Range"].iloc[0]
+        leader_name = faculty_leader_name  # can later make this a dropdown if desired
+        leader_df = data.load_team("MonthlyMetric", leader_name, view="KPI Table")
+        team_df = leader_df[leader_df["Date Range"] == latest_range].copy()
+
+        # --- Define KPI metrics ---
+        metrics = [
+            "% to Delivery Target",
+            "% to Availability Target",
+            "% Sessions on Time",
+            "% Parents Updates Done on Time",
+            "% of Active Students with Progress Updates Completed in last 2 months"
+        ]
+
+        # --- Convert decimals to percentages ---
+        for m in metrics:
+            team_df[m] = team_df[m] * 100
+
+        st.title("Team KPI Overview")
+        st.caption(f"Faculty Leader: {leader_name} | Latest Date Range: {latest_range}")
+
+        st.divider()
+        st.divider()
+
+        # --- Top KPI summary cards (2 rows if needed) ---
+        st.subheader("Team Summary KPIs")
+        n_metrics = len(metrics)
+        n_cols = 3  # 3 cards per row
+        rows_needed = (n_metrics + n_cols - 1) // n_cols
+        for r in range(rows_needed):
+            cols = st.columns(n_cols)
+            for i, col in enumerate(cols):
+                idx = r * n_cols + i
+                if idx < n_metrics:
+                    metric = metrics[idx]
+                    avg = team_df[metric].mean(skipna=True)
+                    if avg >= 90:
+                        color = "🟢"
+                    elif avg >= 75:
+                        color = "🟡"
+                    else:
+                        color = "🔴"
+                    col.metric(label=f"{color} {metric}", value=f"{avg:.1f}%")
+
+
+
+        st.divider()
+        st.divider()
+        st.subheader("📊 Team KPI Changes from Previous Period")
+
+        # --- Sort date ranges chronologically ---
+        date_ranges_sorted = df.sort_values("period_idx")["Date Range"].dropna().unique().tolist()
+
+        if len(date_ranges_sorted) < 2:
+            st.info("Not enough time periods available to calculate changes.")
+        else:
+            latest_range = date_ranges_sorted[-1]
+            prev_range = date_ranges_sorted[-2]
+
+
+            # Filter for the FL's team in both time periods
+            latest_team = leader_df[leader_df["Date Range"] == latest_range]
+            prev_team = leader_df[leader_df["Date Range"] == prev_range]
+
+            # Compute team averages for both periods
+            latest_avg = latest_team[metrics].mean()
+            prev_avg = prev_team[metrics].mean()
+
+            # Compute change (percentage point difference)
+            change_df = pd.DataFrame({
+                "Metric": metrics,
+                f"{prev_range} Avg": prev_avg.values,
+                f"{latest_range} Avg": latest_avg.values,
+                "Change (pp)": (latest_avg - prev_avg).values
+            })
+
+            # Convert to percent format for readability
+            for c in [f"{prev_range} Avg", f"{latest_range} Avg", "Change (pp)"]:
+                change_df[c] = change_df[c] * 100
+
+            # Format change direction and color
+            def format_change(val):
+                if pd.isna(val):
+                    return ""
+                arrow = "⬆️" if val > 0 else ("⬇️" if val < 0 else "➡️")
+                return f"{arrow} {val:+.1f} pp"
+
+            change_df["Change Display"] = change_df["Change (pp)"].apply(format_change)
+
+    #         # Display results as a nice table
+    #         st.dataframe(
+    #             change_df[["Metric", f"{prev_range} Avg", f"{latest_range} Avg", "Change Display"]]
+    #             .rename(columns={
+    #                 f"{prev_range} Avg": f"{prev_range}",
+    #                 f"{latest_range} Avg": f"{latest_range}",
+    #                 "Change Display": "Change"
+    #             }),
+    #             hide_index=True,
+    #             use_container_width=True
+    #         )
+
+            # Style the change column
+            def style_change(val):
+                color = "lightgreen" if val > 0 else ("lightcoral" if val < 0 else "white")
+                return f"background-color: {color}; font-weight: bold; text-align: center"
+
+            # Apply styling
+            styled_df = change_df[["Metric", f"{prev_range} Avg", f"{latest_range} Avg", "Change (pp)"]].copy()
+            styled_df_display = styled_df.style.format({
+                f"{prev_range} Avg": "{:.1f}%",
+                f"{latest_range} Avg": "{:.1f}%",
+                "Change (pp)": "{:+.1f} pp"
+            }).applymap(style_change, subset=["Change (pp)"])
+
+            st.write(styled_df_display)
+
+
+
+
+            # Determine symmetric range
+            max_abs_change = max(abs(change_df["Change (pp)"].max()), abs(change_df["Change (pp)"].min()))
+
+            # Put the plot in a wide central column
+            col1, col2, col3 = st.columns([1, 12, 1])
+            with col2:
+                fig_change = px.bar(
+                    change_df,
+                    x="Metric",
+                    y="Change (pp)",
+                    color="Change (pp)",
+                    color_continuous_scale=["red", "white", "green"],
+                    text=change_df["Change (pp)"].apply(lambda x: f"{x:+.1f} pp"),
+                    title=f"Change in Team Averages: {prev_range} → {latest_range}",
+                    height=600
+                )
+
+                # Set symmetric color axis
+                fig_change.update_layout(
+                    title_x=0.20,
+                    xaxis_title="",
+                    yaxis_title="Change (percentage points)",
+                    margin=dict(l=20, r=20, t=60, b=40),
+                    coloraxis_colorbar=dict(title="Change"),
+                )
+                fig_change.update_traces(marker=dict(
+                    coloraxis="coloraxis"
+                ))
+                fig_change.update_coloraxes(cmin=-max_abs_change, cmax=max_abs_change)
+
+                st.plotly_chart(fig_change, use_container_width=True)          
+
+
+
+        st.divider()
+        # --- Team Comparison vs Other Teams ---
+        st.divider()
+        st.subheader("Team Metrics Comparison vs Other Teams")
+
+        # Tier selection
+        tier_options = ["All"] + sorted(df["Tier"].dropna().unique())
+        selected_tier = st.selectbox("Filter by Tier (optional):", tier_options, index=0)
+
+        # Team averages by Faculty Leader for the latest period, filtered by tier if selected
+        if selected_tier != "All":
+            leader_group = data.load_kpi_means("Faculty Leader", period_idx=latest_idx, Tier=selected_tier)[metrics]
+            title_prefix = f"{selected_tier} Tier Team Comparison"
+        else:
+            leader_group = data.load_kpi_means("Faculty Leader", period_idx=latest_idx)[metrics]
+            title_prefix = "Team Comparison"
+
+        for metric in metrics:
+            st.markdown(f"### {metric}")
+
+            plot_df = leader_group.reset_index()
+            plot_df = plot_df.sort_values(by=metric, ascending=False)
+
+            # Multiply by 100 for plotting
+            plot_df[metric + "_pct"] = plot_df[metric] * 100
+
+            # Create a color map so the current Faculty Leader is blue, others gray
+            color_map = {fl: ("blue" if fl == leader_name else "lightgray") for fl in plot_df["Faculty Leader"]}
+
+            fig = px.bar(
+                plot_df,
+                x="Faculty Leader",
+                y=metric + "_pct",
+                color="Faculty Leader",
+                color_discrete_map=color_map,
+                text=plot_df[metric + "_pct"].apply(lambda x: f"{x:.1f}%"),
+                labels={metric + "_pct": "Percent"},
+                height=400
+            )
+
+            # Set y-axis max
+            if metric == "% to Availability Target":
+                y_max = 130
+            else:
+                y_max = 100
+
+            fig.update_layout(
+                title=dict(text=f"{title_prefix}: {metric}", x=0.5, xanchor="center"),
+                showlegend=False,
+                margin=dict(l=20, r=20, t=50, b=40),
+                yaxis=dict(range=[0, y_max], tickformat=".0f%")
+            )
+
+            # Center the chart
+            col1, col2, col3 = st.columns([1, 4, 1])
+            with col2:
+                st.plotly_chart(fig, use_container_width=True)
+
+
+
+        st.divider()
+        st.divider()
+
+
+        # --- KPI Distributions Across Team ---
+        st.subheader("Team KPI Leaderboard")
+
+        # Some FLs get the MonthlyMetricFullData leaderboard instead
+        if leader["full_data_leaderboard"]:
+            team_df2 = data.load_team("MonthlyMetricFullData", faculty_leader_name, view="KPI Table").copy()
+
+            # --- Fix hidden/trailing spaces in column names ---
+            team_df2.columns = team_df2.columns.str.strip()
+
+            # --- Use YOUR corrected metrics list ---
+            metrics = [
+                "Current Tier",
+                "Delivery Target",
+                "Avg. Delivery Actual",
+                "% to Delivery Target",
+                "Availability Target",
+                "Avg. Availability Actual",
+                "% to Availability Target",
+                "Prep Time %",
+                "% Parents Updates Done on Time",
+                "% Sessions on Time",
+                "Ratio of PPW Events with Attached PPWs",
+                "% of Active Students with Progress Updates Completed",
+                "# of NPS Scores",
+                "Avg. NPS Score",
+                "Weighted Repurchases",
+                "Autoattendance",
+                "New 1 on 1 Students",
+                "total 1 on 1 students",
+                "Average AI Score for Progress Updates"
+            ]
+
+            display_cols = ["Tutor Name"] + metrics
+
+            # Convert ONLY numeric metrics
+            for m in metrics:
+                if m != "Current Tier":   # <-- DON'T COERCE Current Tier
+                    team_df2[m] = pd.to_numeric(team_df2[m], errors="coerce")
+
+            leaderboard_df = team_df2[display_cols].reset_index(drop=True)
+
+            # --- Leaderboard: best (green) / worst (red) per metric ---
+            # st.dataframe only draws the rows in view; the tutor names are
+            # pinned so they stay in place when scrolling sideways
+            numeric_metrics = [m for m in metrics if m != "Current Tier"]
+            column_config = {"Tutor Name": st.column_config.TextColumn(pinned=True)}
+            column_config.update({m: st.column_config.NumberColumn(format="%.1f%%") for m in numeric_metrics})
+            st.dataframe(
+                leaderboard.style(leaderboard_df, numeric_metrics),
+                column_config=column_config,
+                hide_index=True,
+                height=500,
+                width="stretch",
+            )
+
+            exports.download_buttons(
+                "Download Team KPI Data",
+                leaderboard_df,
+                "Team_KPI_Data",
+                ("Team KPI Data", faculty_leader_name, version),
+            )
+        else:
+            # Ensure metrics are numeric
+            for m in metrics:
+                team_df[m] = pd.to_numeric(team_df[m], errors="coerce")
+
+            team_df["Overall KPI Score"] = team_df[metrics].mean(axis=1)
+            display_cols = ["Tutor Name"] + metrics + ["Overall KPI Score"]
+            leaderboard_df = (
+                team_df[display_cols]
+                .sort_values(by="Overall KPI Score", ascending=False)
+                .reset_index(drop=True)
+            )
+
+            # Cell text and best (green) / worst (red) colors per metric
+            display_table_values, colors = leaderboard.cells(leaderboard_df, ["Tutor Name"], metrics + ["Overall KPI Score"])
+
+            # --- Plotly Table ---
+            fig_table = go.Figure(
+                data=[
+                    go.Table(
+                        header=dict(
+                            values=[f"<b>{c}</b>" for c in display_cols],
+                            fill_color="lightgrey",
+                            align="center",
+                        ),
+                        cells=dict(
+                            values=display_table_values,
+                            fill_color=colors,
+                            align="center",
+                        ),
+                    )
+                ]
+            )
+
+            fig_table.update_layout(margin=dict(l=0, r=0, t=0, b=0), height=500)
+            st.plotly_chart(fig_table, use_container_width=True)
+
+            # --- Download button ---
+            exports.download_buttons(
+                "Download Team KPI Data",
+                leaderboard_df,
+                f"{leader_name.replace(' ', '_')}_KPI_Data",
+                ("Team KPI Data", faculty_leader_name, version),
+            )
+
+
+    # ---- Data loads (sidebar) ----
+    # Source file reads so far, and how many requests shared a read already
+    # running instead of starting their own (see data.load_stats)
+    with st.sidebar.expander("Data loads"):
+        stats = data.load_stats()
+        if stats:
+            st.dataframe(pd.DataFrame.from_dict(stats, orient="index"))
+        else:
+            st.caption("No source files read yet.")
@@ -0,0 +1,71 @@
+import collections
+import io
+import threading
+
+import streamlit as st
+
+# Files behind the dashboards' download buttons.
+#
+# Downloads are rare, so a file is only written when its button is clicked
+# (st.download_button calls a callable `data` on click, not on every rerun).
+# Written files are kept per (export, FL, data version, format) and shared by
+# all sessions, so downloading the same data again doesn't write it again.
+
+FORMATS = {
+    "CSV": (".csv", "text/csv"),
+    "Parquet": (".parquet", "application/vnd.apache.parquet"),
+    "XLSX": (".xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+# Files kept
+MAX_FILES = 64
+
+_files = collections.OrderedDict()  # key -> file bytes, least recently used first
+_lock = threading.Lock()
+
+
+def _write(df, fmt):
+    if fmt == "CSV":
+        return df.to_csv(index=False).encode("utf-8")
+    buffer = io.BytesIO()
+    if fmt == "Parquet":
+        df.to_parquet(buffer, index=False)
+    else:
+        df.to_excel(buffer, index=False)
+    return buffer.getvalue()
+
+
+def _file(key, df, fmt):
+    with _lock:
+        contents = _files.get(key)
+        if contents is not None:
+            _files.move_to_end(key)
+            return contents
+    contents = _write(df, fmt)
+    with _lock:
+        _files[key] = contents
+        _files.move_to_end(key)
+        while len(_files) > MAX_FILES:
+            _files.popitem(last=False)
+    return contents
+
+
+def download_buttons(label, df, file_name, key):
+    """A row of download buttons for `df`, one per format in FORMATS.
+
+    `file_name` is without extension. `key` identifies what `df` holds,
+    including the data it was computed from, e.g. ("Concerns", FL, tutor,
+    version) with the data.data_version() read before loading that data.
+    `df` is only read when a button is clicked, so it mustn't be changed
+    afterwards.
+    """
+    key = tuple(key)
+    for column, (fmt, (extension, mime)) in zip(st.columns(len(FORMATS)), FORMATS.items()):
+        with column:
+            st.download_button(
+                label=f"{label} ({fmt})",
+                data=lambda fmt=fmt: _file(key + (fmt,), df, fmt),
+                file_name=f"{file_name}{extension}",
+                mime=mime,
+                on_click="ignore",
+            )
@@ -0,0 +1,39 @@
+# Faculty Leaders with a dashboard.
+#
+# Keyed by the short name the FL logs in with. For each FL:
+#   name                   their name as it appears in the source sheets
+#   secrets_file           config holding their dashboard password
+#   full_data_leaderboard  show the MonthlyMetricFullData leaderboard on the
+#                          KPI Table page instead of the MonthlyMetric one
+FACULTY_LEADERS = {
+    "Annelies": {
+        "name": "Annelies de Groot",
+        "secrets_file": "configs/annelies_secrets.toml",
+        "full_data_leaderboard": True,
+    },
+    "Ela": {
+        "name": "Ela Cross",
+        "secrets_file": "configs/ela_secrets.toml",
+        "full_data_leaderboard": False,
+    },
+    "Ian": {
+        "name": "Ian Plamondon",
+        "secrets_file": "configs/ian_secrets.toml",
+        "full_data_leaderboard": False,
+    },
+    "Geoff": {
+        "name": "Geoff St. Marie",
+        "secrets_file": "configs/geoff_secrets.toml",
+        "full_data_leaderboard": False,
+    },
+    "Kristin": {
+        "name": "Kristin Haase-Alvey",
+        "secrets_file": "configs/kristin_secrets.toml",
+        "full_data_leaderboard": False,
+    },
+    "Jessica": {
+        "name": "Jessica Milner",
+        "secrets_file": "configs/jessica_secrets.toml",
+        "full_data_leaderboard": False,
+    },
+}
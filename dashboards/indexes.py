@@ -0,0 +1,68 @@
+import weakref
+
+import numpy as np
+
+# Lookup structures built over the shared source frames.
+#
+# Pages used to find their rows with boolean masks over whole sheets, on every
+# rerun. The structures here are built once per loaded frame: they are
+# memoized on the frame object itself, and since every new version of a
+# source file is loaded into new frames, they are rebuilt exactly once per
+# data version and dropped together with the frame they index.
+
+_derived = {}  # (id(frame), name) -> (weak reference to frame, value)
+
+
+def derived(frame, name, build):
+    """Return build(frame), computed once per frame object."""
+    key = (id(frame), name)
+    entry = _derived.get(key)
+    if entry is not None and entry[0]() is frame:
+        return entry[1]
+    value = build(frame)
+    _derived[key] = (weakref.ref(frame, lambda _, key=key: _derived.pop(key, None)), value)
+    return value
+
+
+def partition(frame, column):
+    """{value: rows of `frame` with that value in `column`}
+
+    Rows with a blank `column` are left out, like with an `==` mask. Raises
+    KeyError if `frame` has no such column.
+    """
+    return dict(iter(frame.groupby(column, observed=True, sort=False)))
+
+
+def partition_by_members(frame, column, groups):
+    """{group: rows of `frame` whose `column` is one of the group's members}
+
+    `groups` maps each group to its member values (e.g. each FL to the tutors
+    on their roster). Rows keep their original order, like with an `isin` mask.
+    """
+    rows_by_value = frame.groupby(column, observed=True, sort=False).indices
+    parts = {}
+    for group, members in groups.items():
+        rows = [rows_by_value[member] for member in set(members) if member in rows_by_value]
+        parts[group] = frame.take(np.sort(np.concatenate(rows)) if rows else np.array([], dtype=np.intp))
+    return parts
+
+
+def tutor_key(name):
+    """Normalize a tutor name for matching across sources.
+
+    The sheets don't agree on spacing and capitalization ("Jane Doe" in one,
+    "jane doe " in another), so names are compared case-insensitively with
+    runs of whitespace collapsed.
+    """
+    return " ".join(str(name).split()).casefold()
+
+
+def tutor_rows(frame, column):
+    """{tutor_key: positions of that tutor's rows in `frame`}
+
+    Raises KeyError if `frame` has no such column.
+    """
+    rows_by_key = {}
+    for name, rows in frame.groupby(column, observed=True, sort=False).indices.items():
+        rows_by_key.setdefault(tutor_key(name), []).append(rows)
+    return {key: np.sort(np.concatenate(rows)) for key, rows in rows_by_key.items()}
@@ -0,0 +1,342 @@
+import hashlib
+import json
+import os
+import threading
+import xml.etree.ElementTree as ET
+import zipfile
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from dashboards import periods
+
+# Columnar snapshots of the source workbooks.
+#
+# Parsing December_Annual_Reviews.xlsx is slow (xl/sharedStrings.xml alone is
+# ~9 MB), so every sheet is converted to a Parquet file once per version of the
+# sheet and the dashboards read the Parquet copy instead. Sheet versions come
+# from the CRC32s in the zip directory, so a monthly update that only touches
+# MonthlyMetric re-parses MonthlyMetric alone.
+
+SNAPSHOT_DIR = ".snapshots"
+
+# Bump when the way a parsed sheet is turned into a snapshot changes, so that
+# existing snapshots get rebuilt
+SNAPSHOT_FORMAT = 3
+
+_write_lock = threading.Lock()
+
+
+# Zip parts whose content determines what pandas reads out of an .xlsx file.
+# docProps/, calcChain.xml, themes etc. change on every save and are ignored.
+_XLSX_DATA_PARTS = (
+    "xl/workbook.xml",
+    "xl/_rels/workbook.xml.rels",
+    "xl/sharedStrings.xml",
+    "xl/styles.xml",
+)
+
+_fingerprints = {}
+
+
+def _content_hash(file):
+    digest = hashlib.sha1()
+    if zipfile.is_zipfile(file):
+        # The zip central directory already stores a CRC32 per part, so the
+        # workbook never has to be inflated to fingerprint it
+        with zipfile.ZipFile(file) as zf:
+            for info in sorted(zf.infolist(), key=lambda i: i.filename):
+                name = info.filename
+                if name in _XLSX_DATA_PARTS or name.startswith("xl/worksheets/sheet"):
+                    digest.update(f"{name}:{info.CRC:08x}:{info.file_size}\n".encode())
+    else:
+        with open(file, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+
+def source_version(file):
+    """Identify the content of a source file.
+
+    The hash is only recomputed when the file's mtime or size changes, so
+    calling this on every rerun costs a single stat(). Re-saving or copying a
+    file without changing its data keeps the same version.
+    """
+    stat = os.stat(file)
+    stat_key = (stat.st_mtime_ns, stat.st_size)
+    cached = _fingerprints.get(file)
+    if cached is not None and cached[0] == stat_key:
+        return cached[1]
+    version = _content_hash(file)
+    _fingerprints[file] = (stat_key, version)
+    return version
+
+
+def _snapshot_dir(file):
+    return os.path.join(SNAPSHOT_DIR, os.path.splitext(os.path.basename(file))[0])
+
+
+def _snapshot_path(file, sheet, sheet_version):
+    return os.path.join(_snapshot_dir(file), f"{sheet}-{sheet_version}.parquet")
+
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_json(path, obj):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(obj, f)
+    os.replace(tmp_path, path)
+
+
+_NS_MAIN = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+_NS_REL = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+
+def _sheet_parts(zf):
+    """Map each sheet name to its worksheet part, e.g. "xl/worksheets/sheet1.xml"."""
+    rels = ET.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target", "") for rel in rels}
+    workbook = ET.fromstring(zf.read("xl/workbook.xml"))
+    parts = {}
+    for sheet in workbook.iter(f"{_NS_MAIN}sheet"):
+        target = targets.get(sheet.get(f"{_NS_REL}id"), "")
+        parts[sheet.get("name")] = target[1:] if target.startswith("/") else f"xl/{target}"
+    return parts
+
+
+def _strings_key(file, zf):
+    """Identify the shared-strings table as far as existing snapshots care.
+
+    Worksheets store text as indexes into xl/sharedStrings.xml, so in general a
+    change to that table can change any sheet. Excel however appends new
+    strings at the end, and as long as the previous table is a prefix of the
+    new one, a sheet whose own XML is unchanged still reads back the same. The
+    key therefore only changes when an existing string moved or changed.
+    """
+    try:
+        info = zf.getinfo("xl/sharedStrings.xml")
+    except KeyError:
+        return "none"
+
+    state_path = os.path.join(_snapshot_dir(file), "strings.json")
+    state = _read_json(state_path)
+    if state and state["crc"] == info.CRC and state["size"] == info.file_size:
+        return state["key"]
+
+    xml = zf.read(info)
+    start, end = xml.find(b"<si"), xml.rfind(b"</sst>")
+    body = xml[start:end] if 0 <= start < end else xml
+    if (
+        state
+        and len(body) >= state["length"]
+        and hashlib.sha1(body[:state["length"]]).hexdigest() == state["sha1"]
+    ):
+        key = state["key"]
+    else:
+        key = f"{info.CRC:08x}"
+
+    try:
+        _write_json(state_path, {
+            "crc": info.CRC,
+            "size": info.file_size,
+            "length": len(body),
+            "sha1": hashlib.sha1(body).hexdigest(),
+            "key": key,
+        })
+    except OSError:
+        pass
+    return key
+
+
+_sheet_versions = {}
+
+
+def sheet_versions(file):
+    """Return {sheet name: version} for every sheet of an .xlsx file.
+
+    A sheet's version only depends on its own worksheet part (via the CRC32
+    stored in the zip directory), the styles and the shared strings it can
+    reference. Editing one sheet therefore leaves the others' versions, and
+    their snapshots, untouched.
+    """
+    key = (file, source_version(file))
+    if key in _sheet_versions:
+        return _sheet_versions[key]
+
+    with zipfile.ZipFile(file) as zf, _write_lock:
+        parts = _sheet_parts(zf)
+        crcs = {info.filename: f"{info.CRC:08x}:{info.file_size:x}" for info in zf.infolist()}
+        shared = f"{SNAPSHOT_FORMAT}:{crcs.get('xl/styles.xml')}:{_strings_key(file, zf)}"
+
+    versions = {
+        sheet: hashlib.sha1(f"{shared}:{part}:{crcs.get(part)}".encode()).hexdigest()[:16]
+        for sheet, part in parts.items()
+    }
+    _sheet_versions[key] = versions
+    return versions
+
+
+def _arrow_safe(df):
+    """Make a freshly parsed sheet storable as Parquet.
+
+    Excel columns often mix numbers and text (e.g. "OLD PPW" holds both 1 and
+    "2/4"), which Arrow refuses to store. Those columns are kept as text, with
+    blanks left as NaN so downstream `pd.to_numeric`/`dropna` calls behave the
+    same as on the original frame.
+    """
+    df.columns = [str(c) for c in df.columns]
+    for col in df.columns[df.dtypes == object]:
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df[col] = df[col].where(df[col].isna(), df[col].astype(str))
+    return df
+
+
+# Text columns that repeat the same few values on every row (names, tiers,
+# periods). They're stored as categoricals: one copy of each distinct string,
+# and `==`/`isin` filters compare integer codes instead of Python strings.
+CATEGORY_COLUMNS = {
+    "Tutor Name",
+    "Faculty Leader",
+    "Faculty Leader Name",
+    "Tier",
+    "Current Tier",
+    "Team Name",
+    "Date Range",
+    "tutor_name",
+    "tier",
+    "fl",
+}
+
+
+def compact(df):
+    """Store the CATEGORY_COLUMNS of a parsed sheet as categoricals, in place.
+
+    Numeric columns are left as float64: the KPI ratios don't fit in float32
+    exactly, and averages computed in float32 would shift the plotted values.
+    """
+    for col in df.columns:
+        if str(col).strip() in CATEGORY_COLUMNS and df[col].dtype == object:
+            df[col] = df[col].astype("category")
+    return df
+
+
+def _convert(df):
+    """Turn a freshly parsed sheet into the frame stored in its snapshot."""
+    df = compact(_arrow_safe(df))
+    if "Date Range" in df.columns:
+        periods.add_period_columns(df)
+    return df
+
+
+def _write_snapshot(df, path):
+    directory, name = os.path.split(path)
+    sheet = name.rsplit("-", 1)[0]
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    df.to_parquet(tmp_path)
+    os.replace(tmp_path, path)
+
+    # Drop snapshots of older versions of the same sheet
+    for old in os.listdir(directory):
+        if old != name and old.endswith(".parquet") and old.rsplit("-", 1)[0] == sheet:
+            try:
+                os.remove(os.path.join(directory, old))
+            except OSError:
+                pass
+
+
+WORKBOOK_FILE = "December_Annual_Reviews.xlsx"
+WORKBOOK_SHEETS = [
+    "MonthlyMetric",
+    "MonthlyMetricFullData",
+    "MasterTutor",
+    "AnnualReview",
+    "SubjectAddition",
+]
+
+
+def project(names, wanted):
+    """The entries of `names` listed in `wanted`, in their original order.
+
+    Names are compared with surrounding whitespace stripped, since sheet
+    headers pick up stray spaces (e.g. "Delivery Target "). Wanted names the
+    sheet doesn't have are skipped rather than raising.
+    """
+    wanted = {name.strip() for name in wanted}
+    return [name for name in names if str(name).strip() in wanted]
+
+
+def _read_snapshot(path, columns):
+    if columns is None:
+        return pd.read_parquet(path)
+    return pd.read_parquet(path, columns=project(pq.read_schema(path).names, columns))
+
+
+def read_workbook(file, sheets, columns=None):
+    """Return {sheet name: DataFrame} for every sheet in `sheets`.
+
+    Sheets whose snapshot matches their current version are read from Parquet.
+    The rest are parsed from a single open of the workbook, so the zip is
+    inflated and the shared-strings table decoded once no matter how many
+    sheets changed. Sheets that don't exist in the workbook are left out of
+    the result.
+
+    `columns` optionally maps a sheet name to the columns to load for it (see
+    project()); snapshots always hold every column, so a later caller asking
+    for more columns doesn't force a re-parse.
+    """
+    columns = columns or {}
+    versions = sheet_versions(file)
+    frames = {}
+    missing = []
+    for sheet in sheets:
+        if sheet not in versions:
+            continue
+        path = _snapshot_path(file, sheet, versions[sheet])
+        if os.path.exists(path):
+            frames[sheet] = _read_snapshot(path, columns.get(sheet))
+        else:
+            missing.append(sheet)
+    if not missing:
+        return frames
+
+    with pd.ExcelFile(file) as xls:
+        parsed = {sheet: _convert(xls.parse(sheet)) for sheet in missing}
+
+    for sheet, df in parsed.items():
+        path = _snapshot_path(file, sheet, versions[sheet])
+        try:
+            with _write_lock:
+                _write_snapshot(df, path)
+            frames[sheet] = _read_snapshot(path, columns.get(sheet))
+        except OSError:
+            if sheet in columns:
+                df = df[project(df.columns, columns[sheet])]
+            frames[sheet] = df
+    return frames
+
+
+def read_sheet(file, sheet, columns=None):
+    """Return `sheet` of `file`, served from its Parquet snapshot.
+
+    The workbook is only parsed when no snapshot exists for the current version
+    of the sheet. If the snapshot can't be written (e.g. read-only app dir) the
+    parsed frame is returned as-is. `columns` limits the columns loaded, as in
+    read_workbook().
+    """
+    frames = read_workbook(file, [sheet], None if columns is None else {sheet: columns})
+    if sheet not in frames:
+        raise ValueError(f"Worksheet named '{sheet}' not found")
+    return frames[sheet]
@@ -0,0 +1,70 @@
+import numpy as np
+
+# Team KPI leaderboard tables.
+#
+# The KPI Table page lists every tutor of the team with their KPIs, the best
+# value of each KPI in green and the worst in red. The cells are formatted and
+# colored a column at a time with NumPy rather than cell by cell, so a table
+# of thousands of tutors (e.g. every FL's team at once) is still quick to build.
+# cells() is for a go.Table; style() is for st.dataframe, which sends the table
+# to the browser as Arrow and only draws the rows in view.
+
+BEST_COLOR = "lightgreen"
+WORST_COLOR = "lightcoral"
+CELL_COLOR = "white"
+
+
+def highlights(values):
+    """(best, worst) boolean masks for a 2-D array of metric values, per column.
+
+    A cell is best if it holds its column's highest value and worst if it holds
+    the lowest one (and isn't also best). Every tied cell is marked; blank
+    (NaN) cells and all-blank columns are never marked.
+    """
+    values = np.asarray(values, dtype="float64")
+    # fmax/fmin skip NaN, and give NaN for an all-NaN column without warning
+    best = values == np.fmax.reduce(values, axis=0, initial=np.nan)
+    worst = (values == np.fmin.reduce(values, axis=0, initial=np.nan)) & ~best
+    return best, worst
+
+
+def format_percent(values):
+    """Format numbers like "85.3%", with "" for blanks."""
+    values = np.asarray(values, dtype="float64")
+    return np.where(np.isnan(values), "", np.char.mod("%.1f%%", values)).tolist()
+
+
+def cells(df, label_columns, metric_columns):
+    """Cell values and fill colors of a go.Table leaderboard of `df`.
+
+    Returns (values, colors), each a list with one list per column of
+    label_columns + metric_columns, as go.Table's cells.values and
+    cells.fill_color take them. Label columns are shown as text and metric
+    columns as percentages; metric columns have to be numeric.
+    """
+    metrics = df[metric_columns].to_numpy(dtype="float64")
+    best, worst = highlights(metrics)
+
+    colors = np.full(metrics.shape, CELL_COLOR, dtype=object)
+    colors[best] = BEST_COLOR
+    colors[worst] = WORST_COLOR
+
+    values = [df[c].astype(str).tolist() for c in label_columns]
+    values += [format_percent(metrics[:, j]) for j in range(metrics.shape[1])]
+    label_colors = [[CELL_COLOR] * len(df) for _ in label_columns]
+    return values, label_colors + colors.T.tolist()
+
+
+def style(df, metric_columns):
+    """A Styler of `df` for st.dataframe, with the best and worst cell of each
+    metric column highlighted like in cells().
+
+    Only the colors are set, by position, so `df` may have duplicate index
+    values (e.g. a tutor listed twice). Format the numbers with the
+    st.dataframe's column_config.
+    """
+    best, worst = highlights(df[metric_columns].to_numpy(dtype="float64"))
+    css = np.full(best.shape, "", dtype=object)
+    css[best] = f"background-color: {BEST_COLOR}"
+    css[worst] = f"background-color: {WORST_COLOR}"
+    return df.style.apply(lambda _: css, axis=None, subset=metric_columns)
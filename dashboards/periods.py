@@ -0,0 +1,75 @@
+import functools
+import re
+
+import numpy as np
+import pandas as pd
+
+# Parsing of the reporting-period labels used across the source files, e.g.
+# "10/5/25 - 11/1/25" in MonthlyMetric or "10/5/2025 - 11/1/2025" in the
+# concerns export.
+#
+# A column only ever holds a handful of distinct periods, so each distinct
+# label is parsed once and the result is mapped back onto the rows. Parsed
+# labels are memoized for the life of the process: a label always means the
+# same dates, whichever version of a file it came from. Sheets with a
+# "Date Range" column get typed period columns added once, when their snapshot
+# is built (see add_period_columns).
+
+# Typo'd end dates like "6-14/25" (for "6/14/25"). The month must not follow a
+# digit or "/", so the separator in "5/18/25-6/14/25" is left alone.
+_HYPHENATED_DATE = re.compile(r"(?<![\d/])(\d{1,2})-(\d{1,2}/\d{2,4})")
+
+# Range separators: hyphen, en dash, em dash or "to"
+_SEPARATOR = re.compile(r"\s*(?:[-–—]|\bto\b)\s*")
+
+
+@functools.lru_cache(maxsize=4096)
+def _bounds(label):
+    """(start, end) of one period label, NaT for a part that isn't a date."""
+    text = _HYPHENATED_DATE.sub(r"\1/\2", str(label))
+    parts = _SEPARATOR.split(text)
+    if len(parts) < 2:
+        return pd.NaT, pd.NaT
+    return (
+        pd.to_datetime(parts[0].strip(), errors="coerce"),
+        pd.to_datetime(parts[-1].strip(), errors="coerce"),
+    )
+
+
+def _parse(labels, part):
+    labels = pd.Series(labels)
+    codes, uniques = pd.factorize(labels)
+    parsed = pd.DatetimeIndex([_bounds(label)[part] for label in uniques])
+    return pd.Series(parsed.take(codes, allow_fill=True, fill_value=pd.NaT), index=labels.index)
+
+
+def end_dates(labels):
+    """Return the end date of each period label in `labels` as a datetime Series.
+
+    Labels that aren't a range (or whose end isn't a date) give NaT.
+    """
+    return _parse(labels, 1)
+
+
+def add_period_columns(df, column="Date Range"):
+    """Add typed period columns for the labels in `column`, in place.
+
+    period_start/period_end hold the parsed dates and period_idx numbers the
+    distinct periods chronologically (0 = earliest), so views can sort and
+    pick periods with integer comparisons. Labels that don't parse get -1.
+    """
+    codes, uniques = pd.factorize(df[column])
+    bounds = [_bounds(label) for label in uniques]
+    starts = pd.DatetimeIndex([start for start, _ in bounds])
+    ends = pd.DatetimeIndex([end for _, end in bounds])
+
+    parsed = [i for i in range(len(uniques)) if not pd.isna(starts[i])]
+    order = sorted(parsed, key=lambda i: (starts[i], ends[i]))
+    # One extra slot at the end so that code -1 (missing label) maps to -1
+    ranks = np.full(len(uniques) + 1, -1, dtype="int32")
+    ranks[order] = np.arange(len(order), dtype="int32")
+
+    df["period_start"] = starts.take(codes, allow_fill=True, fill_value=pd.NaT)
+    df["period_end"] = ends.take(codes, allow_fill=True, fill_value=pd.NaT)
+    df["period_idx"] = ranks[codes]
+    return df
@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+from dashboards import data
+
+# Annual review numbers for one tutor.
+#
+# The Annual Reviews page and the offline packets written by report.py compare
+# the same metrics for a tutor with their team's and tier's averages; both get
+# them (and the charts of them) from here.
+
+# Metric column -> label, in the order they are shown
+METRICS = {
+    "sessions_on_time": "Sessions On Time (%)",
+    "% Parents Updates Done on Time": "Percent of Parent Updates Completed on Time",
+    "prep_time": "Prep Time (%)",
+    "Repurchases Weighted": "Weighted Repurchase",
+    "average_nps": "Average NPS",
+    "% of Active Students with Progress Updates Completed in last 2 months": "Progress Update Average Percentage",
+    "current_sci": "Current SCI",
+    "availability_percent": "Percent to Availability (%)",
+    "delivery_percent": "Percent to Delivery (%)"
+}
+
+# Metrics taken from MonthlyMetric (averaged over the tutor's periods) and
+# from the repurchase summary; the rest come from the AnnualReview sheet
+MONTHLY_METRICS = ["% Parents Updates Done on Time", "% of Active Students with Progress Updates Completed in last 2 months"]
+REPURCHASE_METRICS = ["Repurchases Weighted"]
+
+# Stored as fractions, shown as percentages
+PERCENT_METRICS = ["sessions_on_time", "prep_time", "availability_percent", "delivery_percent"] + MONTHLY_METRICS
+
+# Subject Additions are listed just before this metric
+SUBJECTS_BEFORE = "availability_percent"
+
+
+def tutor_metrics(fl, tutor):
+    """The tutor's value of each of METRICS next to their team's and tier's average.
+
+    A list with a dict per metric: "column", "label", "value" (for charts),
+    "display" (formatted value), "team_avg", "team_label" and "team_title"
+    (repurchases compare with the tutor's tier and delivery target instead of
+    the team), and "tier_avg". None if the tutor has no AnnualReview row;
+    metrics from Repurchases or MonthlyMetric are NaN (shown as "n/a") if the
+    tutor has no rows there.
+    """
+    tutor_review = data.load_tutor("AnnualReview", tutor, view="Annual Reviews")
+    if tutor_review.empty:
+        return None
+    row = tutor_review.iloc[0]
+    tutor_tier = row["tier"]
+
+    tutor_repurchases = data.load_tutor("Repurchases", tutor, view="Annual Reviews")
+    row_repurchase = tutor_repurchases.iloc[0] if not tutor_repurchases.empty else None
+    tutor_deliverytarget = row_repurchase["Delivery Target"] if row_repurchase is not None else np.nan
+
+    row_monthly_metric = data.load_tutor("MonthlyMetric", tutor, view="Annual Reviews")
+    tutor_tier_monthly_metric = row_monthly_metric["Tier"].iloc[0] if not row_monthly_metric.empty else np.nan
+
+    # Comparison data
+    annual_review_df = data.load_annual_reviews(view="Annual Reviews")
+    team_df = data.load_team("AnnualReview", fl, view="Annual Reviews")
+    tier_df = annual_review_df[annual_review_df["tier"] == tutor_tier]
+
+    repurchase_df = data.load_repurchases(view="Annual Reviews")
+    tier_repurchase_df = repurchase_df[repurchase_df["Current Tier"] == tutor_tier]
+    tierdelivery_repurchase_df = repurchase_df[
+        (repurchase_df["Current Tier"] == tutor_tier) &
+        (repurchase_df["Delivery Target"] == tutor_deliverytarget)
+    ]
+
+    monthly_metric_df = data.load_monthly_metric(view="Annual Reviews")
+    team_monthly_metric_df = data.load_team("MonthlyMetric", fl, view="Annual Reviews")
+    tier_monthly_metric_df = monthly_metric_df[monthly_metric_df["Tier"] == tutor_tier_monthly_metric]
+
+    metrics = []
+    for col, label in METRICS.items():
+        team_label, team_title = "Team Avg", "VS Team"
+        if col in MONTHLY_METRICS:
+            value = row_monthly_metric[col].mean()  # NaN without rows
+            team_avg = team_monthly_metric_df[col].mean()
+            tier_avg = tier_monthly_metric_df[col].mean()
+        elif col in REPURCHASE_METRICS:
+            value = row_repurchase[col] if row_repurchase is not None else np.nan
+            team_avg = tierdelivery_repurchase_df[col].mean()  # VS Tier/Delivery Target
+            tier_avg = tier_repurchase_df[col].mean()
+            team_label, team_title = "Tier/Delivery Target", "VS Tier/Delivery Target"
+        else:
+            value = row[col]
+            team_avg = team_df[col].mean()
+            tier_avg = tier_df[col].mean()
+
+        if col in PERCENT_METRICS:
+            display = f"{value * 100:.0f}%"
+            value, team_avg, tier_avg = value * 100, team_avg * 100, tier_avg * 100
+        else:
+            display = f"{value:.1f}"
+        if pd.isna(value):
+            display = "n/a"
+
+        metrics.append({
+            "column": col,
+            "label": label,
+            "value": value,
+            "display": display,
+            "team_avg": team_avg,
+            "team_label": team_label,
+            "team_title": team_title,
+            "tier_avg": tier_avg,
+        })
+    return metrics
+
+
+def subjects(tutor):
+    """Subjects the tutor added, or None if the SubjectAddition sheet has no tutor_name column."""
+    if "tutor_name" not in data.load_subject_additions(view="Annual Reviews").columns:
+        return None
+    return data.load_tutor("SubjectAddition", tutor, view="Annual Reviews")["subject"].dropna().tolist()
+
+
+def _bar(tutor, value, avg, avg_label, title):
+    fig = go.Figure(go.Bar(
+        x=[tutor, avg_label],
+        y=[value, avg],
+        marker_color=["blue", "lightgrey"]
+    ))
+    fig.update_layout(
+        title=dict(
+            text=title,
+            x=0.5,
+            xanchor='center',
+            font=dict(size=16)
+        ),
+        yaxis_title="Value",
+        xaxis_title="",
+        height=300,
+        margin=dict(l=20, r=20, t=40, b=20)
+    )
+    return fig
+
+
+def team_figure(tutor, metric):
+    """Bar chart of the tutor's value against the team average of one of tutor_metrics()."""
+    return _bar(tutor, metric["value"], metric["team_avg"], metric["team_label"], metric["team_title"])
+
+
+def tier_figure(tutor, metric):
+    """Bar chart of the tutor's value against the tier average of one of tutor_metrics()."""
+    return _bar(tutor, metric["value"], metric["tier_avg"], "Tier Avg", "VS Tier")
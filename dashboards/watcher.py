@@ -0,0 +1,117 @@
+import logging
+import os
+import threading
+import time
+import zipfile
+
+from dashboards import data, ingest
+
+# Background watcher that keeps the shared data cache warm.
+#
+# Ops replace the source files in the app directory by hand. Without this, the
+# first FL to open a page afterwards pays for reading the new file. The watcher
+# polls the files, waits until a replacement has finished being written, then
+# rebuilds the snapshots and loads the new data into the shared cache.
+
+WATCHED_FILES = [
+    ingest.WORKBOOK_FILE,
+    data.REPURCHASE_FILE,
+    data.CONCERNS_FILE,
+]
+
+POLL_SECONDS = 5
+
+# A changed file is only read once its size and mtime have stopped changing
+# and it was last written at least this long ago
+SETTLE_SECONDS = 10
+
+# While Excel has a workbook open it keeps a "~$<name>" lock file next to it.
+# Wait for it to go away after a change, but not forever: lock files are left
+# behind when Excel crashes (or get copied around with the workbook).
+LOCK_WAIT_SECONDS = 300
+
+log = logging.getLogger(__name__)
+
+_thread = None
+_start_lock = threading.Lock()
+
+
+def _stat(file):
+    try:
+        stat = os.stat(file)
+    except OSError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+def _lock_files(file):
+    directory, name = os.path.split(file)
+    # Excel keeps the whole name; Word-style lock files drop its first two characters
+    return [os.path.join(directory, f"~${name}"), os.path.join(directory, f"~${name[2:]}")]
+
+
+def _is_locked(file):
+    return any(os.path.exists(lock) for lock in _lock_files(file))
+
+
+def _is_complete(file):
+    # A partially copied .xlsx has no zip central directory yet
+    if file.endswith(".xlsx"):
+        return zipfile.is_zipfile(file)
+    return True
+
+
+class _Watcher:
+    def __init__(self, files):
+        self.files = files
+        self._warmed = {}  # file -> stat of the version last loaded
+        self._pending = {}  # file -> (stat, time the change was first seen)
+
+    def poll(self):
+        now = time.time()
+        for file in self.files:
+            stat = _stat(file)
+            if stat is None or stat == self._warmed.get(file):
+                self._pending.pop(file, None)
+                continue
+
+            # On startup load each file straight away: the settle and
+            # completeness checks below still catch one being copied in
+            startup = file not in self._warmed
+            pending = self._pending.get(file)
+            if not startup and (pending is None or pending[0] != stat):
+                # Still being written (or just noticed): check again next poll
+                self._pending[file] = (stat, pending[1] if pending else now)
+                continue
+            if now - stat[0] / 1e9 < SETTLE_SECONDS:
+                continue
+            # On startup there is no write in progress to wait for
+            if not startup and _is_locked(file) and now - pending[1] < LOCK_WAIT_SECONDS:
+                continue
+            if not _is_complete(file):
+                continue
+
+            try:
+                data.warm(file)
+            except Exception as e:
+                log.warning("Could not pre-load %s: %s", file, e)
+            self._warmed[file] = stat
+            self._pending.pop(file, None)
+
+    def run(self):
+        while True:
+            try:
+                self.poll()
+            except Exception:
+                log.exception("File watcher poll failed")
+            time.sleep(POLL_SECONDS)
+
+
+def start(files=None):
+    """Start the watcher thread for this process (only the first call does anything)."""
+    global _thread
+    with _start_lock:
+        if _thread is None:
+            watcher = _Watcher(files or WATCHED_FILES)
+            _thread = threading.Thread(target=watcher.run, name="data-file-watcher", daemon=True)
+            _thread.start()
@@ -1,6 +1,5 @@
 import streamlit as st
 import toml
-import importlib
 import os
 import pandas as pd
 from fractions import Fraction
@@ -8,22 +7,14 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 
+from dashboards import engine, fls, watcher
+
 # --- Streamlit page config (first Streamlit command!) ---
 st.set_page_config(
     page_title="Faculty Leader Dashboards",
     layout="wide"
 )
 
-# --- Mapping of FL -> secrets file ---
-FL_CONFIGS = {
-    "Annelies": "configs/annelies_secrets.toml",
-    "Ela": "configs/ela_secrets.toml",
-    "Ian": "configs/ian_secrets.toml",
-    "Geoff": "configs/geoff_secrets.toml",
-    "Kristin": "configs/kristin_secrets.toml",
-    "Jessica": "configs/jessica_secrets.toml",
-}
-
 # --- Load universal config ---
 CONFIG_FILE = "config.toml"
 if os.path.exists(CONFIG_FILE):
@@ -31,6 +22,9 @@ if os.path.exists(CONFIG_FILE):
 else:
     config = {}
 
+# --- Keep the shared data cache warm (loads it now, reloads when source files are replaced) ---
+watcher.start()
+
 # --- Initialize session state ---
 if "authenticated" not in st.session_state:
     st.session_state["authenticated"] = False
@@ -42,15 +36,15 @@ if st.session_state["authenticated"]:
     if st.button("Logout"):
         st.session_state["authenticated"] = False
         st.session_state["fl_choice"] = None
-        st.experimental_rerun()
+        st.rerun()
 
 # --- Authentication flow ---
 if not st.session_state["authenticated"]:
     # Show FL selection dropdown
-    fl_choice = st.selectbox("Select Faculty Leader:", list(FL_CONFIGS.keys()))
+    fl_choice = st.selectbox("Select Faculty Leader:", list(fls.FACULTY_LEADERS.keys()))
     
     # Load password for selected FL
-    secrets_file = FL_CONFIGS[fl_choice]
+    secrets_file = fls.FACULTY_LEADERS[fl_choice]["secrets_file"]
     if os.path.exists(secrets_file):
         secrets_data = toml.load(secrets_file)
         correct_password = secrets_data.get("auth", {}).get("password", "")
@@ -63,7 +57,7 @@ if not st.session_state["authenticated"]:
         if password == correct_password:
             st.session_state["authenticated"] = True
             st.session_state["fl_choice"] = fl_choice
-            st.experimental_rerun()
+            st.rerun()
         else:
             st.error("Incorrect password")
     st.stop()  # Stop here if not authenticated
@@ -71,9 +65,5 @@ if not st.session_state["authenticated"]:
 # --- User is authenticated at this point ---
 st.success(f"Authenticated! Loading {st.session_state['fl_choice']} dashboard...")
 
-# --- Dynamically import dashboard module ---
-module_name = f"dashboards.{st.session_state['fl_choice']}"
-dashboard_module = importlib.import_module(module_name)
-
-# --- Render dashboard passing universal config ---
-dashboard_module.render_app(config)
+# --- Render the FL's dashboard passing universal config ---
+engine.render_app(st.session_state["fl_choice"], config)
@@ -0,0 +1,196 @@
+"""Write an annual review packet for every tutor of every FL, as HTML files.
+
+    python report.py [--fl Ela --fl Ian ...] [--out reports] [--workers N] [--standalone]
+
+Run it from the app directory: it reads the same source files as the
+dashboards and shows the same numbers and charts as the Annual Reviews page,
+without going through the web server. Packets are written to
+<out>/<FL>/<tutor>.html, next to an index.html listing them. They all load
+the one copy of plotly.js written to <out>/plotly.min.js, so the folder can
+be opened offline, but a packet copied out of it shows no charts. With
+--standalone each packet carries its own copy of plotly.js instead (3.5 MB
+each).
+"""
+import argparse
+import concurrent.futures
+import html
+import logging
+import multiprocessing
+import os
+import re
+
+import plotly.offline
+
+from dashboards import data, fls, reviews
+
+log = logging.getLogger("report")
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+{script}
+<style>
+    body {{ font-family: sans-serif; max-width: 1200px; margin: 0 auto; padding: 20px; }}
+    h1 {{ color: #004466; }}
+    h3 {{ text-align: center; }}
+    .row {{ display: flex; align-items: center; }}
+    .row > div {{ flex: 1; }}
+    .value {{ font-size: 24px; font-weight: bold; text-align: center; }}
+    .subject {{ background-color: #f8f9fa; border-radius: 8px; padding: 10px 15px; margin: 6px 0; }}
+</style>
+</head>
+<body>
+{body}
+</body>
+</html>
+"""
+
+
+def _load():
+    # Everything the packets read. Workers started by fork inherit it from
+    # the parent; others load it again (from the Parquet snapshots).
+    data.load_workbook()
+    data.load_repurchases()
+
+
+def _tutors(fl):
+    return data.load_team("MasterTutor", fl)["Full Name"].dropna().drop_duplicates().sort_values().tolist()
+
+
+def _file_names(tutors):
+    """{tutor: packet file name}, with a numbered suffix where names would clash."""
+    names = {}
+    taken = {"index"}  # compared lowercased, for case-insensitive file systems
+    for tutor in tutors:
+        stem = re.sub(r"[^\w\-]+", "_", tutor).strip("_") or "tutor"
+        name, n = stem, 1
+        while name.lower() in taken:
+            n += 1
+            name = f"{stem}_{n}"
+        taken.add(name.lower())
+        names[tutor] = name + ".html"
+    return names
+
+
+def _script(standalone):
+    if standalone:
+        return f"<script>{plotly.offline.get_plotlyjs()}</script>"
+    return '<script src="../plotly.min.js"></script>'
+
+
+def _chart(fig):
+    return fig.to_html(full_html=False, include_plotlyjs=False)
+
+
+def render_packet(fl, tutor, standalone=False):
+    """The HTML packet of one tutor, or None if they have no annual review.
+
+    A standalone packet includes plotly.js rather than loading ../plotly.min.js.
+    """
+    metrics = reviews.tutor_metrics(fl, tutor)
+    if metrics is None:
+        return None
+    name = html.escape(tutor)
+
+    body = [f"<h1>{name}: Annual Review</h1>", f"<p>Faculty Leader: {html.escape(fl)}</p>"]
+    for metric in metrics:
+        # Subject Additions go just before Percent to Availability, like on the page
+        if metric["column"] == reviews.SUBJECTS_BEFORE:
+            body.append("<hr><h2>Subject Additions</h2>")
+            subjects = reviews.subjects(tutor) or []
+            body += [f"<div class='subject'>📘 {html.escape(str(subject))}</div>" for subject in subjects]
+            if not subjects:
+                body.append("<p><i>None</i></p>")
+
+        body.append(f"<hr><h3>{html.escape(metric['label'])}</h3>")
+        body.append(
+            "<div class='row'>"
+            f"<div class='value'>{name}<br>{html.escape(metric['display'])}</div>"
+            f"<div>{_chart(reviews.team_figure(tutor, metric))}</div>"
+            f"<div>{_chart(reviews.tier_figure(tutor, metric))}</div>"
+            "</div>"
+        )
+    return PAGE.format(title=f"{name}: Annual Review", script=_script(standalone), body="\n".join(body))
+
+
+def write_packet(fl, tutor, path, standalone=False):
+    """Write the tutor's packet to `path`; returns False if they have none."""
+    packet = render_packet(fl, tutor, standalone)
+    if packet is None:
+        return False
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(packet)
+    return True
+
+
+def _write_index(fl, directory, packets):
+    links = [f"<li><a href='{html.escape(file_name)}'>{html.escape(tutor)}</a></li>" for tutor, file_name in packets]
+    body = f"<h1>{html.escape(fl)}: Annual Reviews</h1>\n<ul>\n" + "\n".join(links) + "\n</ul>"
+    with open(os.path.join(directory, "index.html"), "w", encoding="utf-8") as f:
+        f.write(PAGE.format(title=f"{html.escape(fl)}: Annual Reviews", script="", body=body))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write the annual review packets of every tutor as HTML.")
+    parser.add_argument("--fl", action="append", choices=list(fls.FACULTY_LEADERS),
+                        help="only this FL (can be given more than once; default: every FL)")
+    parser.add_argument("--out", default="reports", help="output directory (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(),
+                        help="worker processes (default: one per CPU)")
+    parser.add_argument("--standalone", action="store_true",
+                        help="include plotly.js in every packet, so a packet still shows its charts when "
+                             "copied out of the output directory (by default they all load <out>/plotly.min.js)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+    # Load the data once here; see _load
+    _load()
+
+    os.makedirs(args.out, exist_ok=True)
+    if not args.standalone:
+        with open(os.path.join(args.out, "plotly.min.js"), "w", encoding="utf-8") as f:
+            f.write(plotly.offline.get_plotlyjs())
+
+    jobs = {}  # future -> (FL, tutor, file name)
+    packets = {}  # FL -> [(tutor, file name)]
+    skipped = {}  # FL -> [tutors without an AnnualReview row]
+    methods = multiprocessing.get_all_start_methods()
+    context = multiprocessing.get_context("fork" if "fork" in methods else None)
+    with concurrent.futures.ProcessPoolExecutor(args.workers, mp_context=context, initializer=_load) as pool:
+        for short_name in args.fl or fls.FACULTY_LEADERS:
+            fl = fls.FACULTY_LEADERS[short_name]["name"]
+            directory = os.path.join(args.out, short_name)
+            os.makedirs(directory, exist_ok=True)
+            packets[fl] = []
+            skipped[fl] = []
+            # Named here, before any packet is written, so no two tutors share a file
+            for tutor, file_name in _file_names(_tutors(fl)).items():
+                future = pool.submit(write_packet, fl, tutor, os.path.join(directory, file_name), args.standalone)
+                jobs[future] = (fl, tutor, file_name)
+
+        for future in concurrent.futures.as_completed(jobs):
+            fl, tutor, file_name = jobs[future]
+            try:
+                written = future.result()
+            except Exception as e:
+                log.warning("%s: could not write the packet of %s (%s: %s)", fl, tutor, type(e).__name__, e)
+                continue
+            if written:
+                packets[fl].append((tutor, file_name))
+            else:
+                skipped[fl].append(tutor)
+
+    for short_name, leader in fls.FACULTY_LEADERS.items():
+        fl = leader["name"]
+        if fl in packets:
+            _write_index(fl, os.path.join(args.out, short_name), sorted(packets[fl]))
+            log.info("%s: %d packets", fl, len(packets[fl]))
+            if skipped[fl]:
+                log.info("%s: no packet for %d tutors without an AnnualReview row: %s",
+                         fl, len(skipped[fl]), ", ".join(sorted(skipped[fl])))
+
+
+if __name__ == "__main__":
+    main()